@@ -5,4 +5,5 @@ pip install biopython
 pip install dill
 pip install colorama
 pip install alive-progress
+pip install numpy
 
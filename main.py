@@ -1,3 +1,7 @@
+import atexit
+import io
+import sys
+
 import miBase
 import json
 #from miBase import MiRBase._compile_indexes()
@@ -9,13 +13,43 @@ import json
 # some interesting outputs below test examples
 # whole output is dumped into 'mirek_out.txt'
 
+# output is shown on the console as it is printed (so compile progress is visible), while 'mirek_out.txt' is kept in
+# a large buffer and written in blocks, last one at exit
+class Tee(io.TextIOBase):
+    def __init__(self, console, out_file):
+        self.console = console
+        self.out_file = out_file
+
+    def write(self, text):
+        self.console.write(text)
+        self.out_file.write(text)
+        return len(text)
+
+    def flush(self):
+        # only the console is flushed; the file is flushed when it is closed
+        self.console.flush()
+
+    def isatty(self):
+        return self.console.isatty()
+
+
+out_file = open("mirek_out.txt", "w", buffering=1 << 20)
+sys.stdout = Tee(sys.__stdout__, out_file)
+
+
+def close_output():
+    sys.stdout = sys.__stdout__
+    out_file.close()
+
+
+atexit.register(close_output)
+
 # initialising
 m = miBase.MiRBase(version="22")
 #m._compile_indexes()
 
 # l = list()
-# l2 = list()
-# lnp = np.asarray(l2)
+# lnp = np.empty(100000, dtype=np.int64)
 #
 # start = timer()
 # for i in range(100000):
@@ -25,7 +59,7 @@ m = miBase.MiRBase(version="22")
 #
 # start = timer()
 # for i in range(100000):
-#     np.append(lnp, i)
+#     lnp[i] = i
 # end = timer()
 # print(f"Numpy array: {end - start}")
 #
@@ -36,8 +70,7 @@ m = miBase.MiRBase(version="22")
 # print(f"Normal list add: {end - start}")
 #
 # start = timer()
-# for i in range(lnp.shape[0]):
-#     j = lnp[i] + lnp[i]
+# j = lnp + lnp
 # end = timer()
 # print(f"Numpy array add: {end - start}")
 
@@ -58,7 +91,7 @@ m = miBase.MiRBase(version="22")
 # gallus = shorts['gga']
 # print(gallus)
 #
-# short_gal = list(shorts.keys())[list(shorts.values()).index("Gallus gallus")]
+# short_gal = m.get_organisms_short("Gallus gallus")
 # print(short_gal)
 #
 # print("----- get_organisms_short -----")
@@ -110,8 +143,8 @@ print(m.get_taxid(["Homo", "Chrysemys picta", "Amphimedon queenslandica"], verbo
 # print(m.get_tax_level("Gallus gallus"))  # successful search message with elapsed time and printed dict with results
 
 # print("----- get_structure-----")
-m.get_structure(verbose=True)  # no results message
-print(m.get_structure())
+structure = m.get_structure(verbose=True)  # no results message
+print(structure)
 # m.get_structure(["MI0000001", "MI0016085"])  # successful search message with elapsed time
 # m.get_structure(["MI123456789"])  # no results message
 # m.get_structure("MI0000001")  # successful search message with elapsed time
@@ -350,8 +383,8 @@ ref_gallus = m.get_references(mirna_id=[id for mi_obj in sample_gallus for id in
 print(ref_gallus)
 ref_gallus = m.get_references(mirna_id=[id for mi_obj in sample_gallus for id in mi_obj.ID], link=True, verbose=True)
 print(ref_gallus)
-print(m.get_organisms_short(verbose=True))
-shorts = m.get_organisms_short()
+shorts = m.get_organisms_short(verbose=True)
+print(shorts)
 gallus = shorts['gga']
 print(gallus)
 short_gal = m.get_organisms_short("Gallus gallus", verbose=True)
@@ -359,7 +392,7 @@ print(short_gal)
 m.find_cluster(mirna_id="MIMAT0050065", search_type=1, range='-100000', verbose=True)
 #p_obj = m.get_precursor(prec_id=["MI9999000"], organism_name="Homo sapiens", chr='chrX', verbose=True)
 #print(m.high_conf(prec_obj=p_obj["genomic-search"], verbose=True))
-m_obj = m.get_mirna(chr="chrX", organism_name="Homo sapiens", start="153300000", mirna_id="MI9999999999999", tax_level="Viruses", verbose=True)
+# m_obj and p_obj are reused from searches above
 print(m_obj["mirna_id-search"])
 m.get_mirna(organism_name="Homo sapiens", chr="chr8", start=11046, end=50000, verbose=True)
 m.get_mirna(start=11046, end=50000, verbose=True)
@@ -368,8 +401,6 @@ m.get_tree(["Deuterostoma"], verbose=True)
 
 cluster_gallus = m.find_cluster(prec_id="MI0007558", range="10000", verbose=True)
 print(cluster_gallus)
-p_obj = m.get_precursor(prec_id=["MI9999000"], organism_name="Homo sapiens", chr='chrX', verbose=True)
-m_obj = m.get_mirna(chr="chrX", organism_name="Homo sapiens", start="153300000", mirna_id="MI9999999999999", tax_level="Viruses", verbose=True)
 print(m_obj["genomic-search"])
 m.dump_sequences(prec_obj=p_obj["genomic-search"], mirna_obj=m_obj["genomic-search"], filepath="test.fasta", verbose=True)
 # for elem in m_obj["tax-search"]:
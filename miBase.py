@@ -9,13 +9,21 @@ import gzip
 import json
 import operator
 import os
+import pickle
+import sys
+import tempfile
+import threading
 import urllib.request
+from collections import OrderedDict
 from collections import defaultdict as dd
 from collections import namedtuple as nt
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce
+from itertools import islice
 from timeit import default_timer as timer
 
 import dill
+import numpy as np
 from Bio import Entrez
 from Bio.Seq import Seq
 from Bio import SeqIO
@@ -47,6 +55,30 @@ class MiRBase:
 
     """
 
+    # data loaded from .mir files on first access of any of its attributes (see `__getattr__`);
+    # key: name of loading function, value: names of attributes set by that function
+    _lazy_data = {
+        "_load_organisms_data": ("_organisms", "_org_sh", "_tax_dct", "_taxid_dct", "_idx_tax_org", "_idx_org_sh",
+                                 "_tax_tree", "_tax_tree_paths"),
+        "_load_records_data": ("_precursors_ID", "_precursors_name", "_miRNAs_ID", "_matures_name", "_high_conf",
+                               "_structures", "_taxonomy_of_prec", "_organisms_of_prec", "_idx_org_mirna",
+                               "_idx_chr_prec", "_idx_chr_mirna", "_idx_strand_prec", "_idx_strand_mirna",
+                               "_idx_tax_mirna", "_prec_columns", "_mirna_columns"),
+    }
+    # search indexes are built by the loading functions and are never set beforehand, otherwise `__getattr__`
+    # would not load them:
+    # _tax_dct - dict of organism full name : list of tax levels
+    # _taxid_dct - dict of organism full name : taxid
+    # _idx_tax_org - dict of every tax level with list of organisms full names
+    # _idx_org_sh - dict of organism full name : 3-letter code
+    # _idx_org_mirna - dict of every organism with list of miRNAs IDs
+    # _idx_chr_prec, _idx_chr_mirna - dicts of every chromosome with list of precursors/miRNAs IDs
+    # _idx_strand_prec, _idx_strand_mirna - dicts of every strand with list of precursors/miRNAs IDs
+    # _idx_tax_mirna - dict of every tax level with list of miRNAs IDs
+    # _tax_tree - taxonomy tree (nested dicts), returned by get_tree()
+    # _tax_tree_paths - dict of taxonomy path (tuple of tax levels) : node of taxonomy tree
+    # _prec_columns, _mirna_columns - Columns of Precursor/MiRNA objects
+
     def __init__(self, version="CURRENT"):
         """Initializes MiRBase object from which data can be accessed using provided functions. Database version might
         be specified.
@@ -59,22 +91,20 @@ class MiRBase:
         self._ftp_path = "https://mirbase.org/ftp/"  # main path to all files in mirbase ftp;
         # old link: "ftp://mirbase.org/pub/mirbase/"
         self._miRBase_version = version  # version on which current instance of tool will be working
-        self._miRNAs_ID = {}  # dict of miRNA ID : miRNA object
-        self._precursors_ID = {}  # dict of pre-miRNA_ID : Precursor object
-        self._org_sh = {}  # dict of 3-letter code : organism full name
-        self._organisms = []  # list of namedtuples Organism = nt('Organism', 'organism division name tree taxid')
-        self._taxonomy_of_prec = dd(list)  # dict of every tax level with list of precursor and/or miRNAs IDs
-        self._organisms_of_prec = dd(list)  # dict of every organism with list of precursors and/or miRNAs IDs
-        self._high_conf = []  # list of high confidence pre-miRNAs and/or miRNAs (IDs)
-        self._structures = {}  # dict of pre-miRNA ID and their structures from miRNA.str file
-        self._precursors_name = {}  # dict of pre-miRNA name : pre-miRNA ID
-        self._matures_name = {}  # dict of miRNA name : miRNA ID
+        # data and search indexes are loaded on first access (see `_lazy_data` and `_init_data()` for descriptions)
+        self._data_lock = threading.RLock()  # guards loading of data on first access
 
         self._versions = utils._cache_versions()
 
+        self._results_cache = OrderedDict()  # cache of search results (used by utils.memoize)
+        self._results_lock = threading.Lock()  # guards `_results_cache` during concurrent searches
+
         self._loader = MiRLoad  # reference to loader class - very important
 
         self._Organism = nt('Organism', 'organism division name tree taxid')
+        # columns of genome coordinates; row is an index of the object (in `objects`) owning the coordinate, pos is an
+        # index of the coordinate in `genome_coordinates` of that object
+        self._Columns = nt('Columns', 'objects row pos start end')
 
         utils._show_banner()
 
@@ -84,7 +114,9 @@ class MiRBase:
             for elem in self._versions.keys():
                 path = os.path.join("data", elem)
                 os.makedirs(path, exist_ok=True)
-            self._load_all_data()
+            # data itself is loaded on first access
+            if not all(os.path.isfile(data_file) for data_file in self._data_files()):
+                raise FileNotFoundError("Missing data files")
         except:
             print(f"{Fore.RED}[Mir-Us]   Missing data files (.mir); "
                   f"{Fore.YELLOW}performing compilation of data files...\n"
@@ -93,7 +125,6 @@ class MiRBase:
                 self._compile_indexes()
                 init()
                 print(f"{Fore.YELLOW}[Mir-Us]   Data files compiled successfully!")
-                self._load_all_data()
             except Exception as e:
                 init()
                 print(
@@ -101,15 +132,70 @@ class MiRBase:
                         e) + "Log file with full error description is located in /logs directory.")
                 exit()
 
+    def __getattr__(self, name):
+        """Loads data on first access of its attribute. Called only for attributes which are not set yet.
+        """
+        for loader, attributes in MiRBase._lazy_data.items():
+            if name in attributes:
+                # object without its state (e.g. during unpickling or copying) has no data to load
+                lock = self.__dict__.get("_data_lock")
+                if lock is None:
+                    break
+                with lock:
+                    # data might have been loaded by another thread in the meantime
+                    if name not in self.__dict__:
+                        # data is loaded into a copy of the object and then set at once, so other threads never
+                        # see partially loaded data
+                        loading = object.__new__(type(self))
+                        loading.__dict__.update(self.__dict__)
+                        with utils._gc_paused():
+                            getattr(loading, loader)()
+                        self.__dict__.update(loading.__dict__)
+                return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _init_data(self):
+        """Sets empty data structures, which are filled by the loader during compilation of data files.
+        """
+        self._miRNAs_ID = {}  # dict of miRNA ID : miRNA object
+        self._precursors_ID = {}  # dict of pre-miRNA_ID : Precursor object
+        self._org_sh = {}  # dict of 3-letter code : organism full name
+        self._organisms = []  # list of namedtuples Organism = nt('Organism', 'organism division name tree taxid')
+        self._taxonomy_of_prec = dd(list)  # dict of every tax level with list of precursor and/or miRNAs IDs
+        self._organisms_of_prec = dd(list)  # dict of every organism with list of precursors and/or miRNAs IDs
+        self._high_conf = []  # list of high confidence pre-miRNAs and/or miRNAs (IDs)
+        self._structures = {}  # dict of pre-miRNA ID and their structures from miRNA.str file
+        self._precursors_name = {}  # dict of pre-miRNA name : pre-miRNA ID
+        self._matures_name = {}  # dict of miRNA name : miRNA ID
+
+    def _data_files(self):
+        """Returns paths to all .mir data files of the current database version.
+        """
+        names = ["organisms", "org_short", "precursors_ID", "precursors_name", "miRNAs_ID", "matures_name",
+                 "structures", "taxonomy_prec", "taxonomy_org"]
+        if self._versions[self._miRBase_version]["high_conf"] is not None:
+            names.append("high_conf")
+        return [f'data/{self._miRBase_version}/{name}.mir' for name in names]
+
     def _compile_indexes(self):
         """Produces .mir files which contain indexed data.
         """
         path = self._ftp_path + self._miRBase_version
+        files = self._versions[self._miRBase_version]
+        self._init_data()
 
         # INITIALIZE PROGRESSBAR-------------------------------------
-        with alive_bar(10, bar='blocks') as bar:
+        with tempfile.TemporaryDirectory() as tmp_dir, alive_bar(10, bar='blocks') as bar:
+            # DOWNLOAD SOURCE FILES----------------------------------
+            # files are downloaded concurrently before parsing, instead of one by one between parsing steps
+            keys = [key for key in ("org_file", "mirna_dat", "high_conf", "mirna_str") if files.get(key) is not None]
+            with ThreadPoolExecutor(max_workers=utils.download_workers) as executor:
+                sources = dict(zip(keys, executor.map(lambda key: utils._download(path + files[key], tmp_dir),
+                                                      keys)))
+            # -------------------------------------------------------
+
             # COMPILE ORGANISMS--------------------------------------
-            self._loader.load_organisms(self, file_path=path + self._versions[self._miRBase_version]["org_file"])
+            self._loader.load_organisms(self, file_path=sources["org_file"])
             with open(f'data/{self._miRBase_version}/organisms.mir', 'wb') as fh_org_dump:
                 dill.dump(self._organisms, fh_org_dump)
             fh_org_dump.close()
@@ -121,8 +207,8 @@ class MiRBase:
             # -------------------------------------------------------
 
             # COMPILE MIRNA------------------------------------------
-            self._loader.load_miRNA(self, file_path=path + self._versions[self._miRBase_version]["mirna_dat"])
-            self._loader.load_genome(self, file_path=path + self._versions[self._miRBase_version]["genomes"])
+            self._loader.load_miRNA(self, file_path=sources["mirna_dat"])
+            self._loader.load_genome(self, file_path=path + files["genomes"])
             with open(f'data/{self._miRBase_version}/precursors_ID.mir', 'wb') as fh_precid_dump:
                 dill.dump(self._precursors_ID, fh_precid_dump)
             fh_precid_dump.close()
@@ -143,7 +229,7 @@ class MiRBase:
 
             # COMPILE HIGH-CONF--------------------------------------
             try:
-                self._loader.load_hc(self, file_path=path + self._versions[self._miRBase_version]["high_conf"])
+                self._loader.load_hc(self, file_path=sources.get("high_conf"))
                 with open(f'data/{self._miRBase_version}/high_conf.mir', 'wb') as fh_high_dump:
                     dill.dump(self._high_conf, fh_high_dump)
                 fh_high_dump.close()
@@ -153,7 +239,7 @@ class MiRBase:
             # -------------------------------------------------------
 
             # COMPILE STRUCTURES-------------------------------------
-            self._loader.load_structures(self, file_path=path + self._versions[self._miRBase_version]["mirna_str"])
+            self._loader.load_structures(self, file_path=sources["mirna_str"])
             with open(f'data/{self._miRBase_version}/structures.mir', 'wb') as fh_mirstruc_dump:
                 dill.dump(self._structures, fh_mirstruc_dump)
             fh_mirstruc_dump.close()
@@ -172,56 +258,115 @@ class MiRBase:
             bar()
             # -------------------------------------------------------
 
-    def _load_all_data(self):
-        """Loads all data from .mir files and assigns to data structures
+        # DROP COMPILATION DATA----------------------------------
+        # data and its search indexes are loaded from compiled files on first access
+        for attributes in MiRBase._lazy_data.values():
+            for name in attributes:
+                self.__dict__.pop(name, None)
+        with self._results_lock:
+            self._results_cache.clear()
+        # -------------------------------------------------------
+
+    def _load_organisms_data(self):
+        """Loads organisms data from .mir files and makes taxonomy indexes
         """
         # LOAD ORGANISMS-----------------------------------------
+        # files are written with dill, but contain only standard pickles, which are read faster by the C unpickler
         with open(f'data/{self._miRBase_version}/organisms.mir', 'rb') as fh_org_load:
-            self._organisms = dill.load(fh_org_load)
+            self._organisms = pickle.load(fh_org_load)
         fh_org_load.close()
+
+        with open(f'data/{self._miRBase_version}/org_short.mir', 'rb') as fh_orgsh_load:
+            self._org_sh = pickle.load(fh_orgsh_load)
+        fh_orgsh_load.close()
+        # -------------------------------------------------------
+
+        # MAKE TAXONOMY INDEXES----------------------------------
+        tax_dct = self._make_tax_dict()
+        self._taxid_dct = {getattr(org, "name"): getattr(org, "taxid") for org in self._organisms}
+        self._idx_tax_org = dd(list)
+        for org, tax in tax_dct.items():
+            for tax_level in tax:
+                self._idx_tax_org[tax_level].append(org)
+        self._tax_dct = tax_dct
+        # abbreviations of organisms; if a name has more abbreviations, the first one is used
+        self._idx_org_sh = {}
+        for short, org in self._org_sh.items():
+            self._idx_org_sh.setdefault(org, short)
+        # -------------------------------------------------------
+
+        # MAKE TAXONOMY TREE-------------------------------------
+        def tree():
+            return dd(tree)
+
+        # levels are created first, so lists of organisms are placed after sublevels (as in previous versions)
+        org_tree = tree()
+        for tax in tax_dct.values():
+            node = org_tree
+            for tax_level in tax:
+                node = node[tax_level]
+        for org, tax in tax_dct.items():
+            node = org_tree
+            for tax_level in tax:
+                node = node[tax_level]
+            node.setdefault("!organism", []).append(org)
+
+        # every node is also accessible by its whole path, so slicing the tree does not walk its levels
+        tree_paths = {}
+        to_visit = [((), org_tree)]
+        while to_visit:
+            path, node = to_visit.pop()
+            tree_paths[path] = node
+            for key, child in node.items():
+                if key == "!organism":
+                    child.sort()
+                else:
+                    to_visit.append((path + (key,), child))
+        self._tax_tree = org_tree
+        self._tax_tree_paths = tree_paths
         # -------------------------------------------------------
 
+    def _load_records_data(self):
+        """Loads precursors and miRNAs data from .mir files, merges it and loads search indexes
+        """
         # LOAD MIRNA---------------------------------------------
         with open(f'data/{self._miRBase_version}/precursors_ID.mir', 'rb') as fh_precid_load:
-            self._precursors_ID = dill.load(fh_precid_load)
+            self._precursors_ID = pickle.load(fh_precid_load)
         fh_precid_load.close()
 
         with open(f'data/{self._miRBase_version}/precursors_name.mir', 'rb') as fh_precname_load:
-            self._precursors_name = dill.load(fh_precname_load)
+            self._precursors_name = pickle.load(fh_precname_load)
         fh_precid_load.close()
 
         with open(f'data/{self._miRBase_version}/miRNAs_ID.mir', 'rb') as fh_mirnasid_load:
-            self._miRNAs_ID = dill.load(fh_mirnasid_load)
+            self._miRNAs_ID = pickle.load(fh_mirnasid_load)
         fh_mirnasid_load.close()
 
         with open(f'data/{self._miRBase_version}/matures_name.mir', 'rb') as fh_maturename_load:
-            self._matures_name = dill.load(fh_maturename_load)
+            self._matures_name = pickle.load(fh_maturename_load)
         fh_maturename_load.close()
-
-        with open(f'data/{self._miRBase_version}/org_short.mir', 'rb') as fh_orgsh_load:
-            self._org_sh = dill.load(fh_orgsh_load)
-        fh_orgsh_load.close()
         # -------------------------------------------------------
 
         # LOAD HIGH-CONF-----------------------------------------
+        self._high_conf = []
         if self._versions[self._miRBase_version]["high_conf"] is not None:
             with open(f'data/{self._miRBase_version}/high_conf.mir', 'rb') as fh_high_load:
-                self._high_conf = dill.load(fh_high_load)
+                self._high_conf = pickle.load(fh_high_load)
             fh_high_load.close()
         # -------------------------------------------------------
 
         # LOAD STRUCTURES----------------------------------------
         with open(f'data/{self._miRBase_version}/structures.mir', 'rb') as fh_mirstruc_load:
-            self._structures = dill.load(fh_mirstruc_load)
+            self._structures = pickle.load(fh_mirstruc_load)
         fh_mirstruc_load.close()
         # -------------------------------------------------------
 
         # LOAD TAXONOMY------------------------------------------
         with open(f'data/{self._miRBase_version}/taxonomy_prec.mir', 'rb') as fh_taxprec_load:
-            self._taxonomy_of_prec = dill.load(fh_taxprec_load)
+            self._taxonomy_of_prec = pickle.load(fh_taxprec_load)
         fh_taxprec_load.close()
         with open(f'data/{self._miRBase_version}/taxonomy_org.mir', 'rb') as fh_taxorg_load:
-            self._organisms_of_prec = dill.load(fh_taxorg_load)
+            self._organisms_of_prec = pickle.load(fh_taxorg_load)
         fh_taxorg_load.close()
         # -------------------------------------------------------
 
@@ -229,6 +374,10 @@ class MiRBase:
         self._merge_data()
         # -------------------------------------------------------
 
+        # LOAD INDEXES-------------------------------------------
+        self._load_indexes()
+        # -------------------------------------------------------
+
     def _merge_data(self):
         """Merges data - some data structures lacks certain parts and this function completes them.
         """
@@ -238,34 +387,221 @@ class MiRBase:
         # -------------------------------------------------------
 
         # MERGE STRUCTURES---------------------------------------
-        for prec in self._precursors_ID:
-            self._precursors_ID[prec].structure = self._structures[prec]
+        for prec_id, prec in self._precursors_ID.items():
+            prec.structure = self._structures[prec_id]
         # -------------------------------------------------------
 
         # MERGE TAXONOMY-----------------------------------------
-        organism_codes = list(map(lambda x: getattr(x, "name"), self._organisms))  # list of all organism codes
-        tax_codes = list(map(lambda x: getattr(x, "tree"), self._organisms))
-        tax_codes = [x.rstrip(";").split(";") for x in tax_codes]
-        tax_dct = dict(zip(organism_codes, tax_codes))
+        tax_dct = self._tax_dct
 
-        for prec in self._precursors_ID:
-            self._precursors_ID[prec].taxonomy = tax_dct[self._precursors_ID[prec].organism]
+        for prec in self._precursors_ID.values():
+            prec.taxonomy = tax_dct[prec.organism]
         # -------------------------------------------------------
 
-    def _precursor_retrieve(self, passed_id, current_result):
-        try:
-            if not utils._exists(current_result, self._precursors_ID[passed_id]):
-                return self._precursors_ID[passed_id]
-        except KeyError as e:
-            pass
+        # SHARE REFERENCES---------------------------------------
+        # most records repeat a small number of distinct reference lists, so records with equal references share
+        # a single list (loaded data is never modified)
+        references = {}
+        for record in (*self._precursors_ID.values(), *self._miRNAs_ID.values()):
+            record.references = references.setdefault(tuple(record.references), record.references)
+        # -------------------------------------------------------
+
+    def _load_indexes(self):
+        """Loads search indexes and genome coordinate columns from cache files. If cache files are missing or older
+        than data files, indexes are made from loaded data and cached for the next runs.
+        """
+        path = f'data/{self._miRBase_version}'
+        idx_file = f'{path}/indexes.mir'
+        coords_files = (f'{path}/prec_coords.npy', f'{path}/mirna_coords.npy')
+        data_files = (f'{path}/precursors_ID.mir', f'{path}/miRNAs_ID.mir', f'{path}/taxonomy_prec.mir')
 
-    def _mirna_retrieve(self, passed_id, current_result):
+        if utils._is_up_to_date((idx_file, *coords_files), data_files):
+            try:
+                with open(idx_file, 'rb') as fh_idx_load:
+                    cache = pickle.load(fh_idx_load)
+                # coordinates are memory-mapped, so they are read from disk only when searched
+                prec_coords = np.load(coords_files[0], mmap_mode='r')
+                mirna_coords = np.load(coords_files[1], mmap_mode='r')
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+                # broken cache files are made again below
+                cache = None
+            # cache files of other versions, or coordinates not matching loaded records (e.g. left by a failed
+            # update of cache files) are made again below
+            if cache is not None and cache[0] == self._cache_header(prec_coords.shape, mirna_coords.shape):
+                (_, self._idx_chr_prec, self._idx_strand_prec, self._idx_org_mirna, self._idx_chr_mirna,
+                 self._idx_strand_mirna, self._idx_tax_mirna) = cache
+                self._prec_columns = self._Columns(list(self._precursors_ID.values()), *prec_coords)
+                self._mirna_columns = self._Columns(list(self._miRNAs_ID.values()), *mirna_coords)
+                return
+
+        self._make_indexes()
+        prec_coords = np.stack(self._prec_columns[1:])
+        mirna_coords = np.stack(self._mirna_columns[1:])
+        header = self._cache_header(prec_coords.shape, mirna_coords.shape)
         try:
-            if not utils._exists(current_result, self._miRNAs_ID[passed_id]):
-                return self._miRNAs_ID[passed_id]
-        except KeyError as e:
+            utils._atomic_dump(coords_files[0], lambda fh: np.save(fh, prec_coords))
+            utils._atomic_dump(coords_files[1], lambda fh: np.save(fh, mirna_coords))
+            # indexes contain only standard types, so they are written and read with pickle
+            utils._atomic_dump(idx_file, lambda fh: pickle.dump((header, self._idx_chr_prec, self._idx_strand_prec,
+                                                                  self._idx_org_mirna, self._idx_chr_mirna,
+                                                                  self._idx_strand_mirna, self._idx_tax_mirna), fh))
+        except OSError:
+            # cache is optional - indexes will be made again in the next run
             pass
 
+    def _cache_header(self, prec_shape, mirna_shape):
+        """Makes header of the index cache file, which identifies cache files matching loaded records.
+
+        Args:
+            prec_shape (tuple[int]): Shape of cached coordinate columns of precursors
+            mirna_shape (tuple[int]): Shape of cached coordinate columns of miRNAs
+
+        Returns:
+            tuple: Version of cache files format, numbers of loaded records and shapes of coordinate columns
+        """
+        return utils.cache_version, len(self._precursors_ID), len(self._miRNAs_ID), prec_shape, mirna_shape
+
+    def _make_indexes(self):
+        """Makes search indexes and genome coordinate columns from loaded data.
+        """
+        # MAKE SEARCH INDEXES------------------------------------
+        self._idx_chr_prec = dd(list)
+        self._idx_strand_prec = dd(list)
+        self._idx_org_mirna = dd(list)
+        self._idx_chr_mirna = dd(list)
+        self._idx_strand_mirna = dd(list)
+        self._idx_tax_mirna = dd(list)
+        for prec_id, prec in self._precursors_ID.items():
+            for chromosome in dict.fromkeys(prec.chromosome):
+                self._idx_chr_prec[chromosome].append(prec_id)
+            for strand in dict.fromkeys(prec.strand):
+                self._idx_strand_prec[strand].append(prec_id)
+        for mi_id, mi in self._miRNAs_ID.items():
+            self._idx_org_mirna[mi.organism].append(mi_id)
+            for chromosome in dict.fromkeys(mi.chromosome):
+                self._idx_chr_mirna[chromosome].append(mi_id)
+            for strand in dict.fromkeys(mi.strand):
+                self._idx_strand_mirna[strand].append(mi_id)
+        for tax_level, precs in self._taxonomy_of_prec.items():
+            self._idx_tax_mirna[tax_level] = list(dict.fromkeys(mi for prec in precs
+                                                                for mi in self._precursors_ID[prec].miRNAs))
+        # -------------------------------------------------------
+
+        # MAKE COORDINATE COLUMNS--------------------------------
+        def to_int(coord, index, sentinel):
+            try:
+                return int(coord[index])
+            except (ValueError, TypeError, IndexError):
+                return sentinel
+
+        # coordinates are validated once here; a malformed start or end is replaced with a sentinel lying outside of
+        # any searched bounds, so the coordinate is still found by searches using only its other end; coordinates with
+        # both ends malformed are left out of the columns
+        no_start, no_end = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+        def add_coords(row, coords):
+            for pos, coord in enumerate(coords):
+                start = to_int(coord, 0, no_start)
+                end = to_int(coord, 1, no_end)
+                if start == no_start and end == no_end:
+                    continue
+                rows.append(row)
+                positions.append(pos)
+                starts.append(start)
+                ends.append(end)
+
+        objects = list(self._precursors_ID.values())
+        rows, positions, starts, ends = [], [], [], []
+        for row, prec in enumerate(objects):
+            add_coords(row, prec.genome_coordinates)
+        self._prec_columns = self._make_columns(objects, rows, positions, starts, ends)
+
+        # coordinates of miRNAs are numbered through all their keys
+        objects = list(self._miRNAs_ID.values())
+        rows, positions, starts, ends = [], [], [], []
+        for row, mi in enumerate(objects):
+            add_coords(row, [coord for key in mi.genome_coordinates for coord in mi.genome_coordinates[key]])
+        self._mirna_columns = self._make_columns(objects, rows, positions, starts, ends)
+        # -------------------------------------------------------
+
+    def _make_columns(self, objects, rows, positions, starts, ends):
+        """Makes genome coordinate columns sorted by coordinate start, so ranges of starts can be found with binary
+        search. Columns are 32-bit if all values fit, 64-bit otherwise.
+
+        Args:
+            objects (list): Objects owning the coordinates
+            rows (list[int]): Object row (index in `objects`) for each coordinate
+            positions (list[int]): Index of each coordinate in `genome_coordinates` of its object
+            starts (list[int]): Start of each coordinate
+            ends (list[int]): End of each coordinate
+
+        Returns:
+            Columns: Coordinate columns
+        """
+        columns = np.array([rows, positions, starts, ends], dtype=np.int64)
+        if columns.size and columns.min() >= np.iinfo(np.int32).min and columns.max() <= np.iinfo(np.int32).max:
+            # 32-bit columns halve memory and bandwidth of coordinate comparisons
+            columns = columns.astype(np.int32)
+        order = np.argsort(columns[2], kind='stable')
+        return self._Columns(objects, *columns[:, order])
+
+    @staticmethod
+    def _coords_filter(columns, current_result, start=None, end=None):
+        """Filters objects which have at least one genome coordinate within given bounds. Coordinates of all objects
+        are compared at once, using coordinate columns; range of coordinate starts is found with binary search.
+
+        Args:
+            columns (Columns): Coordinate columns of Precursor or MiRNA objects
+            current_result (list): Objects to be filtered
+            start (int): Lower bound of coordinates
+            end (int): Upper bound of coordinates
+
+        Returns:
+            list: Objects from `current_result` which match given bounds, in the same order
+        """
+        if not current_result:
+            # nothing to filter, e.g. after search of unknown organism
+            return []
+        matched = {id(columns.objects[row]) for row in MiRBase._coords_rows(columns, start=start, end=end)}
+        return [res for res in current_result if id(res) in matched]
+
+    @staticmethod
+    def _coords_rows(columns, start=None, end=None):
+        """Finds objects which have at least one genome coordinate within given bounds (`start` < coordinate end <=
+        `end` and, if both bounds are given, `start` <= coordinate start < `end`).
+
+        Args:
+            columns (Columns): Coordinate columns of Precursor or MiRNA objects
+            start (int): Lower bound of coordinates
+            end (int): Upper bound of coordinates
+
+        Returns:
+            numpy.ndarray: Sorted rows (indexes in `columns.objects`) of found objects, without repetitions
+        """
+        if start is not None and end is not None:
+            # coordinates starting within [start, end)
+            lo, hi = np.searchsorted(columns.start, [start, end])
+            ends = columns.end[lo:hi]
+            rows = columns.row[lo:hi][(start < ends) & (ends <= end)]
+        elif start is not None:
+            rows = columns.row[np.searchsorted(columns.start, start):]
+        else:
+            rows = columns.row[columns.end <= end]
+        return np.unique(rows)
+
+    @staticmethod
+    def _show_search_types(dict_result):
+        """Informs that contradicting criteria were searched separately and shows number of results of each search type.
+
+        Args:
+            dict_result (dict): Results of each search type
+        """
+        print(f"{Fore.YELLOW}[Mir-Us]   Some of the given criteria were contradicting for the search system. Because of"
+              f" that, the results are returned in a dictionary, where contradicting results are separated into"
+              f" different search types. This search consist of (keys of generated dictionary): ")
+        for key in dict_result.keys():
+            print(f"{Fore.BLUE}'{key}': {len(dict_result[key])} results", sep="\n")
+
     def _make_tax_dict(self):
         organism_codes = list(map(lambda x: getattr(x, "name"), self._organisms))
         tax_codes = list(map(lambda x: getattr(x, "tree"), self._organisms))
@@ -292,6 +628,8 @@ class MiRBase:
         return self._organisms
 
     @utils.time_this
+    @utils.accept_scalar_or_list("organism")
+    @utils.memoize
     def get_tax_level(self, organism=None, verbose=False):
         """Returns taxonomy level assigned to organism.
 
@@ -303,23 +641,18 @@ class MiRBase:
             Optional[dict]: Dictionary of organisms and its assigned taxonomy, which is a list of tax levels
             (key: organism, value: taxonomy) or `None` if no results are found.
         """
-        if isinstance(organism, str):
-            organism = [organism]
-        result = {}
-        tax_dct = self._make_tax_dict()
+        tax_dct = self._tax_dct
         try:
-            for org in organism:
-                try:
-                    result[org] = tax_dct[org]
-                except:
-                    continue
-        except:
-            pass
+            # organism names are matched exactly, so each of them is a single dictionary lookup
+            result = {org: list(tax_dct[org]) for org in organism if org in tax_dct}
+        except TypeError:
+            result = {}
         if not result:
             return None
         return result, len(result)
 
     @utils.time_this
+    @utils.memoize
     def get_organism(self, tax=None, verbose=False):
         """Returns organisms which are assigned to a given taxonomy level.
 
@@ -331,14 +664,7 @@ class MiRBase:
             Optional[list[str]]: Full names of organisms representing given taxonomy level or `None` if no results are
             found.
         """
-        result = []
-        tax_dct = self._make_tax_dict()
-        # print(tax_dct)
-        for key, value in tax_dct.items():
-            if tax in value:
-                result.append(key)
-            else:
-                continue
+        result = list(self._idx_tax_org.get(tax, []))
         if not result:
             return None
         return result, len(result)
@@ -357,7 +683,8 @@ class MiRBase:
         """
         result = []
         if organism is not None:
-            result.append(list(self._org_sh.keys())[list(self._org_sh.values()).index(organism)])
+            if organism in self._idx_org_sh:
+                result.append(self._idx_org_sh[organism])
         else:
             result = self._org_sh
         if not result:
@@ -365,6 +692,8 @@ class MiRBase:
         return result[0] if organism else result, len(result)
 
     @utils.time_this
+    @utils.accept_scalar_or_list("organism")
+    @utils.memoize
     def get_taxid(self, organism=None, verbose=False):
         """Returns NCBI taxonomy ID (taxid) assigned to organism
 
@@ -377,25 +706,17 @@ class MiRBase:
             `None` if no results are found.
         """
 
-        if isinstance(organism, str):
-            organism = [organism]
-        result = {}
-        organism_codes = list(map(lambda x: getattr(x, "name"), self._organisms))  # lista wszystkich kodów organizmow
-        tax_id = list(map(lambda x: getattr(x, "taxid"), self._organisms))
-        tax_dct = dict(zip(organism_codes, tax_id))
+        tax_dct = self._taxid_dct
         try:
-            for org in organism:
-                try:
-                    result[org] = tax_dct[org]
-                except:
-                    continue
-        except:
-            pass
+            result = {org: tax_dct[org] for org in organism if org in tax_dct}
+        except TypeError:
+            result = {}
         if not result:
             return None
         return result, len(result)
 
     @utils.time_this
+    @utils.accept_scalar_or_list("prec_id", "mirna_id")
     def get_precursor(self, prec_id: list = None, name="", organism_name="", tax_level="", chr="", start="",
                       end="", strand='', mirna_id=None, verbose=False):
         """Returns precursor objects according to a given search criteria
@@ -447,11 +768,17 @@ class MiRBase:
             | Single search (only one type of search)   | `list` of found objects or `None`    |
             | Multiple searches (contradicting types)   | `dict` of 'type: [found objects]' or `None`. If certain type of search was unsuccessful, its value will be `None` |
         """
+        # search itself is cached, so the notice about search types is shown on every call
+        values = self._search_precursor(prec_id, name, organism_name, tax_level, chr, start, end, strand, mirna_id)
+        if values is not None and isinstance(values[0], dict):
+            self._show_search_types(values[0])
+        return values
+
+    @utils.memoize
+    def _search_precursor(self, prec_id, name, organism_name, tax_level, chr, start, end, strand, mirna_id):
+        """Searches precursors for `get_precursor()`; returns found objects and their number or `None`.
+        """
 
-        if isinstance(prec_id, str) and prec_id:
-            prec_id = [prec_id]
-        if isinstance(mirna_id, str) and mirna_id:
-            mirna_id = [mirna_id]
         dict_result = {}
         first = True
 
@@ -459,23 +786,16 @@ class MiRBase:
         if organism_name and chr or organism_name and strand:
             result = []
             if organism_name:
-                for prec in self._precursors_ID:
-                    if (self._precursors_ID[prec].organism == organism_name) and not \
-                            utils._exists(result, self._precursors_ID[prec]):
-                        result.append(self._precursors_ID[prec])
+                result = [self._precursors_ID[prec] for prec in self._organisms_of_prec.get(organism_name, [])]
                 first = False
             if chr:
                 temp_result = []
                 if first:
-                    for prec in self._precursors_ID:
-                        if (chr in self._precursors_ID[prec].chromosome) and not \
-                                utils._exists(result, self._precursors_ID[prec]):
-                            result.append(self._precursors_ID[prec])
+                    temp_result = [self._precursors_ID[prec] for prec in self._idx_chr_prec.get(chr, [])]
                     first = False
                 elif not first:
-                    for res in result:
-                        if chr in res.chromosome and not utils._exists(temp_result, res):
-                            temp_result.append(res)
+                    # objects found by organism are unique, so they are only filtered
+                    temp_result = [res for res in result if chr in res.chromosome]
                 result = temp_result
             if strand:
                 if not utils._check_strand(strand):
@@ -483,16 +803,10 @@ class MiRBase:
                     return None
                 temp_result = []
                 if first:
-                    for prec in self._precursors_ID:
-                        if (strand in self._precursors_ID[prec].strand) and not utils._exists(result,
-                                                                                              self._precursors_ID[
-                                                                                                  prec]):
-                            result.append(self._precursors_ID[prec])
+                    temp_result = [self._precursors_ID[prec] for prec in self._idx_strand_prec.get(strand, [])]
                     first = False
                 elif not first:
-                    for res in result:
-                        if strand in res.strand and not utils._exists(temp_result, res):
-                            temp_result.append(res)
+                    temp_result = [res for res in result if strand in res.strand]
                 result = temp_result
             if start and end:
                 temp_result = []
@@ -505,16 +819,8 @@ class MiRBase:
                     if not int_start < int_end:
                         print(f"{Fore.RED}[Mir-Us]   Wrong coordinates; start cannot be lower than end")
                         return None
-                    for prec in self._precursors_ID:
-                        for coord in self._precursors_ID[prec].genome_coordinates:
-                            try:
-                                f_start = int(coord[0])
-                                f_stop = int(coord[1])
-                            except:
-                                continue
-                            if (int_start <= f_start < int_end) and (int_start < f_stop <= int_end) \
-                                    and not utils._exists(result, self._precursors_ID[prec]):
-                                result.append(self._precursors_ID[prec])
+                    result = self._coords_filter(self._prec_columns, self._prec_columns.objects,
+                                                 start=int_start, end=int_end)
                     first = False
                 elif not first:
                     int_start = int(start)
@@ -525,16 +831,7 @@ class MiRBase:
                     if not int_start < int_end:
                         print(f"{Fore.RED}[Mir-Us]   Wrong coordinates; start cannot be lower than end")
                         return None
-                    for res in result:
-                        for coord in res.genome_coordinates:
-                            try:
-                                f_start = int(coord[0])
-                                f_stop = int(coord[1])
-                            except:
-                                continue
-                            if (int_start <= f_start < int_end) and (int_start < f_stop <= int_end) \
-                                    and not utils._exists(temp_result, res):
-                                temp_result.append(res)
+                    temp_result = self._coords_filter(self._prec_columns, result, start=int_start, end=int_end)
                     result = temp_result
             if not end and start:
                 temp_result = []
@@ -543,28 +840,14 @@ class MiRBase:
                     if int_start < 0:
                         print(f"{Fore.RED}[Mir-Us]   Incorrect 'start' or 'end' value; 'start' or 'end' cannot be less than zero.")
                         return None
-                    for prec in self._precursors_ID:
-                        for coord in self._precursors_ID[prec].genome_coordinates:
-                            try:
-                                f_start = int(coord[0])
-                            except:
-                                continue
-                            if (int_start <= f_start) and not utils._exists(result, self._precursors_ID[prec]):
-                                result.append(self._precursors_ID[prec])
+                    result = self._coords_filter(self._prec_columns, self._prec_columns.objects, start=int_start)
                     first = False
                 elif not first:
                     int_start = int(start)
                     if int_start < 0:
                         print(f"{Fore.RED}[Mir-Us]   Incorrect 'start' or 'end' value; 'start' or 'end' cannot be less than zero.")
                         return None
-                    for res in result:
-                        for coord in res.genome_coordinates:
-                            try:
-                                f_start = int(coord[0])
-                            except:
-                                continue
-                            if int_start <= f_start and not utils._exists(temp_result, res):
-                                temp_result.append(res)
+                    temp_result = self._coords_filter(self._prec_columns, result, start=int_start)
                     result = temp_result
             if not start and end:
                 temp_result = []
@@ -573,106 +856,65 @@ class MiRBase:
                     if int_end < 0:
                         print(f"{Fore.RED}[Mir-Us]   Incorrect 'start' or 'end' value; 'start' or 'end' cannot be less than zero.")
                         return None
-                    for prec in self._precursors_ID:
-                        for coord in self._precursors_ID[prec].genome_coordinates:
-                            try:
-                                f_stop = int(coord[1])
-                            except:
-                                continue
-                            if (int_end >= f_stop) and not utils._exists(result, self._precursors_ID[prec]):
-                                result.append(self._precursors_ID[prec])
+                    result = self._coords_filter(self._prec_columns, self._prec_columns.objects, end=int_end)
                     first = False
                 elif not first:
                     int_end = int(end)
                     if int_end < 0:
                         print(f"{Fore.RED}[Mir-Us]   Incorrect 'start' or 'end' value; 'start' or 'end' cannot be less than zero.")
                         return None
-                    for res in result:
-                        for coord in res.genome_coordinates:
-                            try:
-                                f_stop = int(coord[1])
-                            except:
-                                continue
-                            if int_end >= f_stop and not utils._exists(temp_result, res):
-                                temp_result.append(res)
+                    temp_result = self._coords_filter(self._prec_columns, result, end=int_end)
                     result = temp_result
             dict_result["genomic-search"] = result
         if prec_id:
-            result = []
-            result = [self._precursor_retrieve(i, result) for i in prec_id if
-                      self._precursor_retrieve(i, result) is not None]
+            # IDs missing in the database are skipped
+            result = [self._precursors_ID[i] for i in prec_id if i in self._precursors_ID]
             dict_result["prec_id-serch"] = result
         if mirna_id:
-            result = []
-            for elem in mirna_id:
-                try:
-                    for prec in self._miRNAs_ID[elem].precursors:
-                        if not utils._exists(result, prec):
-                            result.append(self._precursors_ID[prec])
-                except:
-                    continue
+            result = [self._precursors_ID[prec] for elem in mirna_id if elem in self._miRNAs_ID
+                      for prec in self._miRNAs_ID[elem].precursors]
             dict_result["mirna_id-search"] = result
         if name:
             result = []
             try:
-                if not utils._exists(result, self._precursors_ID[self._precursors_name[name]]):
-                    result.append(self._precursors_ID[self._precursors_name[name]])
+                # a name points to a single precursor, so there is nothing to deduplicate
+                result.append(self._precursors_ID[self._precursors_name[name]])
             except:
                 pass
             dict_result["name-search"] = result
         if not start and not end and not chr and not strand and organism_name:
-            result = []
-            for prec in self._precursors_ID:
-                if (self._precursors_ID[prec].organism == organism_name) and not utils._exists(result,
-                                                                                               self._precursors_ID[
-                                                                                                   prec]):
-                    result.append(self._precursors_ID[prec])
+            result = [self._precursors_ID[prec] for prec in self._organisms_of_prec.get(organism_name, [])]
             dict_result["organism-search"] = result
         if tax_level:
-            result = []
-            for prec in self._precursors_ID:
-                if (tax_level in self._precursors_ID[prec].taxonomy) and not utils._exists(result,
-                                                                                           self._precursors_ID[prec]):
-                    result.append(self._precursors_ID[prec])
+            result = [self._precursors_ID[prec] for prec in self._taxonomy_of_prec.get(tax_level, [])]
             dict_result["tax-search"] = result
         if not start and not end and not organism_name and not strand and chr:
-            result = []
-            for prec in self._precursors_ID:
-                if (chr in self._precursors_ID[prec].chromosome) and not utils._exists(result,
-                                                                                       self._precursors_ID[prec]):
-                    result.append(self._precursors_ID[prec])
+            result = [self._precursors_ID[prec] for prec in self._idx_chr_prec.get(chr, [])]
             dict_result["chr-search"] = result
         if not start and not end and not organism_name and not chr and strand:
             if not utils._check_strand(strand):
                 print(f"{Fore.RED}[Mir-Us]   Incorrect 'strand' value; 'strand' can only be '+' or '-'")
                 return None
-            result = []
-            for prec in self._precursors_ID:
-                if (strand in self._precursors_ID[prec].strand) and not utils._exists(result,
-                                                                                      self._precursors_ID[prec]):
-                    result.append(self._precursors_ID[prec])
+            result = [self._precursors_ID[prec] for prec in self._idx_strand_prec.get(strand, [])]
             dict_result["strand-search"] = result
-        if len(dict_result) >= 1 and not bool([res for res in dict_result.values() if res != []]):
+        if dict_result and not any(dict_result.values()):
             return None
-        if not len(dict_result) > 1:
+        if len(dict_result) <= 1:
             # if list(dict_result.values())[0]:
             #if bool(dict_result):
             if dict_result.values():
-                output = list(dict_result.values())[0]
+                output = next(iter(dict_result.values()))
                 return output, len(output)
             else:
                 return None
         # if len(dict_result) > 1 and not bool([res for res in dict_result.values() if res != []]):
         #     return None
-        print(f"{Fore.YELLOW}[Mir-Us]   Some of the given criteria were contradicting for the search system. Because of"
-              f" that, the results are returned in a dictionary, where contradicting results are separated into"
-              f" different search types. This search consist of (keys of generated dictionary): ")
-        for key in dict_result.keys():
-            print(f"{Fore.BLUE}'{key}': {len(dict_result[key])} results", sep="\n")
         # print([key for key in dict_result.keys()], sep="\n")
-        return dict_result, sum([len(res) for res in list(dict_result.values())])
+        return dict_result, sum(len(res) for res in dict_result.values())
 
     @utils.time_this
+    @utils.accept_scalar_or_list("mirna_id", "mirna_name", "prec_id", "prec_name")
+    @utils.memoize
     def get_references(self, mirna_id=None, mirna_name=None, prec_id=None, prec_name=None, link=False, verbose=False):
         """Returns list of references
 
@@ -690,80 +932,34 @@ class MiRBase:
              links) or `None` if no results are found.
         """
 
-        if isinstance(mirna_id, str):
-            mirna_id = [mirna_id]
-        if isinstance(mirna_name, str):
-            mirna_name = [mirna_name]
-        if isinstance(prec_id, str):
-            prec_id = [prec_id]
-        if isinstance(prec_name, str):
-            prec_name = [prec_name]
-        #result = []
-        result = dd(list)
+        # resolve given IDs and names to records with dictionary membership, skipping missing ones
+        records = []
         if mirna_id:
-            for m_id in mirna_id:
-                try:
-                    for ref in self._miRNAs_ID[m_id].references:
-                        if ref not in result and link is not True:
-                            #result.append(ref)
-                            result[m_id].append(ref)
-                        elif isinstance(link, bool) and link is True:
-                            #result.append(f"https://pubmed.ncbi.nlm.nih.gov/{ref}/")
-                            result[m_id].append(f"https://pubmed.ncbi.nlm.nih.gov/{ref}/")
-                except:
-                    continue
+            records += [(m_id, self._miRNAs_ID[m_id]) for m_id in mirna_id if m_id in self._miRNAs_ID]
         if mirna_name:
-            for mi_name in mirna_name:
-                try:
-                    for ref in self._miRNAs_ID[self._matures_name[mi_name]].references:
-                        if ref not in result and link is not True:
-                            #result.append(ref)
-                            result[mi_name].append(ref)
-                        elif isinstance(link, bool) and link is True:
-                            #result.append(f"https://pubmed.ncbi.nlm.nih.gov/{ref}/")
-                            result[mi_name].append(f"https://pubmed.ncbi.nlm.nih.gov/{ref}/")
-                except:
-                    continue
+            records += [(mi_name, self._miRNAs_ID[self._matures_name[mi_name]]) for mi_name in mirna_name
+                        if mi_name in self._matures_name]
         if prec_name:
-            for p_name in prec_name:
-                try:
-                    for ref in self._precursors_ID[self._precursors_name[p_name]].references:
-                        if ref not in result and link is not True:
-                            #result.append(ref)
-                            result[p_name].append(ref)
-                        elif isinstance(link, bool) and link is True:
-                            #result.append(f"https://pubmed.ncbi.nlm.nih.gov/{ref}/")
-                            result[p_name].append(f"https://pubmed.ncbi.nlm.nih.gov/{ref}/")
-                except:
-                    continue
-            # for mi_name in mirna_name:
-            #     try:
-            #         for mi in self._miRNAs_ID:
-            #             if mi_name in self._miRNAs_ID[mi].name:
-            #                 for ref in self._miRNAs_ID[mi].references:
-            #                     if ref not in result and link is not True:
-            #                         result.append(ref)
-            #                     elif isinstance(link, bool) and link is True:
-            #                         result.append(f"https://pubmed.ncbi.nlm.nih.gov/{ref}/")
-            #     except:
-            #         continue
+            records += [(p_name, self._precursors_ID[self._precursors_name[p_name]]) for p_name in prec_name
+                        if p_name in self._precursors_name]
         if prec_id:
-            for p_id in prec_id:
-                try:
-                    for ref in self._precursors_ID[p_id].references:
-                        if ref not in result and link is not True:
-                            #result.append(ref)
-                            result[p_id].append(ref)
-                        elif isinstance(link, bool) and link is True:
-                            #result.append(f"https://pubmed.ncbi.nlm.nih.gov/{ref}/")
-                            result[p_id].append(f"https://pubmed.ncbi.nlm.nih.gov/{ref}/")
-                except:
-                    continue
+            records += [(p_id, self._precursors_ID[p_id]) for p_id in prec_id if p_id in self._precursors_ID]
+        result = dd(list)
+        for key, record in records:
+            # type of output is chosen once per record, not for every reference
+            if link is True:
+                refs = [f"https://pubmed.ncbi.nlm.nih.gov/{ref}/" for ref in record.references]
+            else:
+                refs = [ref for ref in record.references if ref not in result]
+            if refs:
+                result[key].extend(refs)
         if not result:
             return None
         return dict(result), len(result)
 
     @utils.time_this
+    @utils.accept_scalar_or_list("id", "name")
+    @utils.memoize
     def get_structure(self, id=None, name=None, verbose=False):
         """Returns dictionary of precursors IDs with assigned structures in dot-bracket format
 
@@ -780,30 +976,15 @@ class MiRBase:
         result = {}
         id_result = {}
         name_result = {}
-        if isinstance(id, str):
-            id = [id]
-        if isinstance(name, str):
-            name = [name]
         if id:
-            try:
-                # for i in id:
-                #     try:
-                #         id_result[self._precursors_ID[i].ID] = self._precursors_ID[i].structure
-                #     except:
-                #         continue
-                id_result = {self._precursors_ID[i].ID: self._precursors_ID[i].structure for i in id}
-            except:
-                pass
+            # missing IDs are skipped
+            id_result = {i: self._precursors_ID[i].structure for i in id if i in self._precursors_ID}
         if name:
+            # names are resolved to IDs with the name index, instead of comparing names of all precursors
             try:
-                #for i in name:
-                    #try:
-                name_result = {self._precursors_ID[prec].name: self._precursors_ID[prec].structure for
-                          prec in self._precursors_ID if self._precursors_ID[prec].name in name}
-                #name_result = dict_res
-                    #except:
-                    #    continue
-            except:
+                name_result = {n: self._precursors_ID[self._precursors_name[n]].structure for n in name
+                               if n in self._precursors_name}
+            except TypeError:
                 pass
         result = {**id_result, **name_result}
         if not result:
@@ -811,6 +992,7 @@ class MiRBase:
         return result, len(result)
 
     @utils.time_this
+    @utils.accept_scalar_or_list("mirna_id", "prec_id")
     def get_mirna(self, mirna_id: list = None, name="", organism_name="", tax_level="", chr="", start="",
                   end="", strand='', prec_id: list = None, verbose=False):
         """Returns miRNA objects according to given search criteria.
@@ -862,11 +1044,17 @@ class MiRBase:
             | Multiple searches (contradicting types)   | `dict` of 'type: [found objects]' or `None`. If certain type of search was unsuccessful, its value will be `None` |
 
         """
+        # search itself is cached, so the notice about search types is shown on every call
+        values = self._search_mirna(mirna_id, name, organism_name, tax_level, chr, start, end, strand, prec_id)
+        if values is not None and isinstance(values[0], dict):
+            self._show_search_types(values[0])
+        return values
+
+    @utils.memoize
+    def _search_mirna(self, mirna_id, name, organism_name, tax_level, chr, start, end, strand, prec_id):
+        """Searches miRNAs for `get_mirna()`; returns found objects and their number or `None`.
+        """
 
-        if isinstance(mirna_id, str) and mirna_id:
-            mirna_id = [mirna_id]
-        if isinstance(prec_id, str) and prec_id:
-            prec_id = [prec_id]
         # print(mirna_id)
         dict_result = {}
         first = True
@@ -875,28 +1063,16 @@ class MiRBase:
         if organism_name and chr or organism_name and strand:
             result = []
             if organism_name:
-                for mi in self._miRNAs_ID:
-                    if (self._miRNAs_ID[mi].organism == organism_name) and not utils._exists(result,
-                                                                                             self._miRNAs_ID[mi]):
-                        result.append(self._miRNAs_ID[mi])
+                result = [self._miRNAs_ID[mi] for mi in self._idx_org_mirna.get(organism_name, [])]
                 first = False
             if chr:
                 temp_result = []
                 if first:
-                    for mi in self._miRNAs_ID:
-                        if (chr in self._miRNAs_ID[mi].chromosome) and not utils._exists(result,
-                                                                                            self._miRNAs_ID[mi]):
-                            result.append(self._miRNAs_ID[mi])
+                    temp_result = [self._miRNAs_ID[mi] for mi in self._idx_chr_mirna.get(chr, [])]
                     first = False
                 elif not first:
-                    # count = 0
-                    # print(len(result))
-                    for res in result:
-                        # count += 1
-                        # print(f"Current {(count)}: {res.chromosome}")
-                        if chr in res.chromosome and not utils._exists(temp_result, res):
-                            # print(f"Kept:{res.chromosome}")
-                            temp_result.append(res)
+                    # objects found by organism are unique, so they are only filtered
+                    temp_result = [res for res in result if chr in res.chromosome]
                 result = temp_result
                 # print("Chr from genomic context")
             if strand:
@@ -905,14 +1081,10 @@ class MiRBase:
                     return None
                 temp_result = []
                 if first:
-                    for mi in self._miRNAs_ID:
-                        if (strand in self._miRNAs_ID[mi].strand) and not utils._exists(result, self._miRNAs_ID[mi]):
-                            result.append(self._miRNAs_ID[mi])
+                    temp_result = [self._miRNAs_ID[mi] for mi in self._idx_strand_mirna.get(strand, [])]
                     first = False
                 elif not first:
-                    for res in result:
-                        if strand in res.strand and not utils._exists(temp_result, res):
-                            temp_result.append(res)
+                    temp_result = [res for res in result if strand in res.strand]
                 result = temp_result
                 # print("Strand from genomic context")
             if start and end:
@@ -926,17 +1098,8 @@ class MiRBase:
                     if not int_start < int_end:
                         print(f"{Fore.RED}[Mir-Us]   Wrong coordinates; start cannot be lower than end")
                         return None
-                    for mi in self._miRNAs_ID:
-                        for key in self._miRNAs_ID[mi].genome_coordinates:
-                            for coord in self._miRNAs_ID[mi].genome_coordinates[key]:
-                                try:
-                                    f_start = int(coord[0])
-                                    f_stop = int(coord[1])
-                                except:
-                                    continue
-                                if (int_start <= f_start < int_end) and (int_start < f_stop <= int_end) \
-                                        and not utils._exists(result, self._miRNAs_ID[mi]):
-                                    result.append(self._miRNAs_ID[mi])
+                    result = self._coords_filter(self._mirna_columns, self._mirna_columns.objects,
+                                                 start=int_start, end=int_end)
                     first = False
                 elif not first:
                     int_start = int(start)
@@ -947,17 +1110,7 @@ class MiRBase:
                     if not int_start < int_end:
                         print(f"{Fore.RED}[Mir-Us]   Wrong coordinates; start cannot be lower than end")
                         return None
-                    for res in result:
-                        for key in res.genome_coordinates:
-                            for coord in res.genome_coordinates[key]:
-                                try:
-                                    f_start = int(coord[0])
-                                    f_stop = int(coord[1])
-                                except:
-                                    continue
-                                if (int_start <= f_start < int_end) and (int_start < f_stop <= int_end) \
-                                        and not utils._exists(temp_result, res):
-                                    temp_result.append(res)
+                    temp_result = self._coords_filter(self._mirna_columns, result, start=int_start, end=int_end)
                     result = temp_result
             if not end and start:
                 temp_result = []
@@ -966,35 +1119,14 @@ class MiRBase:
                     if int_start < 0:
                         print(f"{Fore.RED}[Mir-Us]   Incorrect 'start' or 'end' value; 'start' or 'end' cannot be less than zero.")
                         return None
-                    for mi in self._miRNAs_ID:
-                        for key in self._miRNAs_ID[mi].genome_coordinates:
-                            for coord in self._miRNAs_ID[mi].genome_coordinates[key]:
-                                try:
-                                    f_start = int(coord[0])
-                                except:
-                                    continue
-                                if (int_start <= f_start) and not utils._exists(
-                                        result, self._miRNAs_ID[mi]):
-                                    result.append(self._miRNAs_ID[mi])
+                    result = self._coords_filter(self._mirna_columns, self._mirna_columns.objects, start=int_start)
                     first = False
                 elif not first:
                     int_start = int(start)
                     if int_start < 0:
                         print(f"{Fore.RED}[Mir-Us]   Incorrect 'start' or 'end' value; 'start' or 'end' cannot be less than zero.")
                         return None
-                    # count = 0
-                    for res in result:
-                        # count += 1
-                        for key in res.genome_coordinates:
-                            for coord in res.genome_coordinates[key]:
-                                try:
-                                    f_start = int(coord[0])
-                                    # print(f"Current {(count)}: {f_start}")
-                                except:
-                                    continue
-                                if int_start <= f_start and not utils._exists(temp_result, res):
-                                    temp_result.append(res)
-                                    # print(f"Kept:{f_start}")
+                    temp_result = self._coords_filter(self._mirna_columns, result, start=int_start)
                     result = temp_result
                 # print("Only start")
             if not start and end:
@@ -1004,92 +1136,50 @@ class MiRBase:
                     if int_end < 0:
                         print(f"{Fore.RED}[Mir-Us]   Incorrect 'start' or 'end' value; 'start' or 'end' cannot be less than zero.")
                         return None
-                    for mi in self._miRNAs_ID:
-                        for key in self._miRNAs_ID[mi].genome_coordinates:
-                            for coord in self._miRNAs_ID[mi].genome_coordinates[key]:
-                                try:
-                                    f_stop = int(coord[1])
-                                except:
-                                    continue
-                                if (int_end >= f_stop) and not utils._exists(
-                                        result, self._miRNAs_ID[mi]):
-                                    result.append(self._miRNAs_ID[mi])
+                    result = self._coords_filter(self._mirna_columns, self._mirna_columns.objects, end=int_end)
                     first = False
                 elif not first:
                     int_end = int(end)
                     if int_end < 0:
                         print(f"{Fore.RED}[Mir-Us]   Incorrect 'start' or 'end' value; 'start' or 'end' cannot be less than zero.")
                         return None
-                    # count = 0
-                    for res in result:
-                        # count += 1
-                        for key in res.genome_coordinates:
-                            for coord in res.genome_coordinates[key]:
-                                try:
-                                    f_stop = int(coord[1])
-                                    # print(f"Current {(count)}: {f_start}")
-                                except:
-                                    continue
-                                if int_end >= f_stop and not utils._exists(temp_result, res):
-                                    temp_result.append(res)
-                                    # print(f"Kept:{f_start}")
+                    temp_result = self._coords_filter(self._mirna_columns, result, end=int_end)
                     result = temp_result
             dict_result["genomic-search"] = result
         if mirna_id:
-            result = []
-            result = [self._mirna_retrieve(i, result) for i in mirna_id if self._mirna_retrieve(i, result) is not None]
+            # IDs missing in the database are skipped
+            result = [self._miRNAs_ID[i] for i in mirna_id if i in self._miRNAs_ID]
             dict_result["mirna_id-search"] = result
         if prec_id:
-            result = []
-            for elem in prec_id:
-                try:
-                    for mi in self._precursors_ID[elem].miRNAs:
-                        if not utils._exists(result, mi):
-                            result.append(self._miRNAs_ID[mi])
-                except:
-                    continue
+            result = [self._miRNAs_ID[mi] for elem in prec_id if elem in self._precursors_ID
+                      for mi in self._precursors_ID[elem].miRNAs]
             dict_result["prec_id-search"] = result
         if name:
             result = []
             try:
-                if not utils._exists(result, self._miRNAs_ID[self._matures_name[name]]):
-                    result.append(self._miRNAs_ID[self._matures_name[name]])
+                # a name points to a single miRNA, so there is nothing to deduplicate
+                result.append(self._miRNAs_ID[self._matures_name[name]])
             except:
                 pass
             dict_result["name-search"] = result
         if not start and not end and not chr and not strand and organism_name:
-            result = []
-            for mi in self._miRNAs_ID:
-                if (self._miRNAs_ID[mi].organism == organism_name) and not utils._exists(result, self._miRNAs_ID[mi]):
-                    result.append(self._miRNAs_ID[mi])
+            result = [self._miRNAs_ID[mi] for mi in self._idx_org_mirna.get(organism_name, [])]
             dict_result["organism-search"] = result
         if tax_level:
-            result = []
-            for prec in self._precursors_ID:
-                if tax_level in self._precursors_ID[prec].taxonomy:
-                    mi_id = self._precursors_ID[prec].miRNAs
-                    for elem in mi_id:
-                        if not utils._exists(result, self._miRNAs_ID[elem]):
-                            result.append(self._miRNAs_ID[elem])
+            result = [self._miRNAs_ID[mi] for mi in self._idx_tax_mirna.get(tax_level, [])]
             dict_result["tax-search"] = result
         if not start and not end and not organism_name and not strand and chr:
-            result = []
-            for mi in self._miRNAs_ID:
-                if (chr in self._miRNAs_ID[mi].chromosome) and not utils._exists(result, self._miRNAs_ID[mi]):
-                    result.append(self._miRNAs_ID[mi])
+            result = [self._miRNAs_ID[mi] for mi in self._idx_chr_mirna.get(chr, [])]
             dict_result["chr-search"] = result
         if not start and not end and not organism_name and not chr and strand:
             if not utils._check_strand(strand):
                 print(f"{Fore.RED}[Mir-Us]   Incorrect 'strand' value; 'strand' can only be '+' or '-'")
                 return None
-            result = []
-            for mi in self._miRNAs_ID:
-                if (strand in self._miRNAs_ID[mi].strand) and not utils._exists(result, self._miRNAs_ID[mi]):
-                    result.append(self._miRNAs_ID[mi])
+            result = [self._miRNAs_ID[mi] for mi in self._idx_strand_mirna.get(strand, [])]
             dict_result["strand-search"] = result
-        if len(dict_result) >= 1 and not bool([res for res in dict_result.values() if res != []]):
+        if dict_result and not any(dict_result.values()):
             return None
-        if not len(dict_result) > 1:
+        if len(dict_result) <= 1:
             # print(f"print: {dict_result}")
             # print("less than 1 key")
             # if list(dict_result.values())[0]:
@@ -1097,19 +1187,14 @@ class MiRBase:
             if dict_result.values():
                 # print(dict_result.values())
                 # print("if values")
-                output = list(dict_result.values())[0]
+                output = next(iter(dict_result.values()))
                 return output, len(output)
             else:
                 return None
         # if len(dict_result) >= 1 and not bool([res for res in dict_result.values() if res != []]):
         #     return None
-        print(f"{Fore.YELLOW}[Mir-Us]   Some of the given criteria were contradicting for the search system. Because of"
-              f" that, the results are returned in a dictionary, where contradicting results are separated into"
-              f" different search types. This search consist of (keys of generated dictionary): ")
-        for key in dict_result.keys():
-            print(f"{Fore.BLUE}'{key}': {len(dict_result[key])} results", sep="\n")
         # print([key for key in dict_result.keys()], sep="\n")
-        return dict_result, sum([len(res) for res in list(dict_result.values())])
+        return dict_result, sum(len(res) for res in dict_result.values())
 
     @utils.time_this
     def find_cluster(self, mirna_id: str = None, prec_id: str = None, search_type="up-downstream", range=None, verbose=False):
@@ -1136,103 +1221,92 @@ class MiRBase:
         """
 
         result = []
+        found = set()  # id() of objects in result
 
-        def search_prec2(self, start, org, range):
-            int_start = 0
-            int_end = 0
+        def search_window(self, int_start, int_end, org):
+            # precursors within the window are found with binary search on genome coordinate columns; rows follow
+            # the order of precursors in the database
             count = 0
-            if search_type == "up-downstream" or search_type == 0:
-                int_start = start - range
-                # print(int_start)
-                int_end = start + range
-                # print(int_end)
-            if search_type == "downstream" or search_type == 2:
-                int_start = start
-                int_end = start + range
-            if search_type == "upstream" or search_type == 1:
-                int_start = start - range
-                # print(int_start)
-                int_end = start
-            for prec in self._precursors_ID:
-                if self._precursors_ID[prec].organism == org:
-                    for coord in self._precursors_ID[prec].genome_coordinates:
-                        try:
-                            f_start = int(coord[0])
-                            f_stop = int(coord[1])
-                        except:
-                            continue
-                        if (int_start <= f_start < int_end) and (
-                                int_start < f_stop <= int_end) and not utils._exists(result, self._precursors_ID[prec]):
-                            count += 1
-                            print(f"{count}, {self._precursors_ID[prec].ID}: {coord}")
-                            result.append(self._precursors_ID[prec])
-
-        def search_mirna2(self, start, org, range):
-            int_start = 0
-            int_end = 0
-            count = 0
-            if search_type == "up-downstream" or search_type == 0:
-                int_start = start - range
-                print(f"new_start: {int_start}")
-                int_end = start + range
-                print(f"new_end: {int_end}")
-            elif search_type == "upstream" or search_type == 1:
-                int_start = start
-                int_end = start + range
-            elif search_type == "downstream" or search_type == 2:
-                int_start = start - range
-                # print(int_start)
-                int_end = start
-            else:
-                print(f"{Fore.RED}[Mir-Us]   Incorrect search type; possible search types are:\n "
-                      f" - 'up-downstream' or '0'\n  - 'upstream' or '1'\n  - 'downstream' or '2'")
-                return None
-            for prec in self._precursors_ID:
-                if self._precursors_ID[prec].organism == org:
-                #if self._miRNAs_ID[mirna_id].organism == org and mirna_id in self._precursors_ID[prec].miRNAs:
-                    for coord in self._precursors_ID[prec].genome_coordinates:
-                        try:
-                            # print(coord)
-                            f_start = int(coord[0])
-                            f_stop = int(coord[1])
-                        except:
-                            continue
-                        if (int_start <= f_start < int_end) and (
-                                int_start < f_stop <= int_end) and not utils._exists(result, self._precursors_ID[prec]):
-                            count += 1
-                            print(f"{count}, {self._precursors_ID[prec].ID}: {coord}")
-                            result.append(self._precursors_ID[prec])
+            columns = self._prec_columns
+            lo, hi = np.searchsorted(columns.start, [int_start, int_end])
+            ends = columns.end[lo:hi]
+            window = np.flatnonzero((int_start < ends) & (ends <= int_end)) + lo
+            # the first coordinate of each precursor within the window is shown
+            first = {}
+            for i in window[np.lexsort((columns.pos[window], columns.row[window]))]:
+                first.setdefault(int(columns.row[i]), int(columns.pos[i]))
+            for row, pos in first.items():
+                prec = columns.objects[row]
+                if prec.organism == org and id(prec) not in found:
+                    coord = prec.genome_coordinates[pos]
+                    count += 1
+                    print(f"{count}, {prec.ID}: {coord}")
+                    found.add(id(prec))
+                    result.append(prec)
+
         # print(f"Mirna: {mirna_id} Prec: {prec_id}")
         if (mirna_id is not None or "") and (prec_id is not None or ""):
             print(f"{Fore.RED}[Mir-Us]   Contradicting actions; clusters cannot be searched between different types of "
                   f"objects.\nPlease, search MiRNA and Precursor objects separately.")
             return None
         elif mirna_id:
-            if int(range) < 0:
+            int_range = int(range)  # converted once, not for every coordinate
+            if int_range < 0:
                 print(f"{Fore.RED}[Mir-Us]   Incorrect 'range' value; range cannot be less than zero.")
                 return None
             org = self._miRNAs_ID[mirna_id].organism
             #print(org)
+            # search window is given by offsets from start of each coordinate, chosen once for the whole search
+            both_ways = search_type == "up-downstream" or search_type == 0
+            if both_ways:
+                offsets = (-int_range, int_range)
+            elif search_type == "upstream" or search_type == 1:
+                offsets = (0, int_range)
+            elif search_type == "downstream" or search_type == 2:
+                offsets = (-int_range, 0)
+            else:
+                offsets = None
             # for key in self._miRNAs_ID[mirna_id].genome_coordinates:
             #     for coord in self._miRNAs_ID[mirna_id].genome_coordinates[key]:
             for coord in self._precursors_ID[self._miRNAs_ID[mirna_id].precursors[0]].genome_coordinates:
                 start_position = int(coord[0])
                 # print(f"org_start: {start_position}")
-                search_mirna2(self, start_position, org, int(range))
+                if offsets is None:
+                    # unknown search type is reported for every coordinate
+                    print(f"{Fore.RED}[Mir-Us]   Incorrect search type; possible search types are:\n "
+                          f" - 'up-downstream' or '0'\n  - 'upstream' or '1'\n  - 'downstream' or '2'")
+                    continue
+                int_start = start_position + offsets[0]
+                int_end = start_position + offsets[1]
+                if both_ways:
+                    print(f"new_start: {int_start}")
+                    print(f"new_end: {int_end}")
+                search_window(self, int_start, int_end, org)
         elif prec_id:
-            if int(range) < 0:
+            int_range = int(range)
+            if int_range < 0:
                 print(f"{Fore.RED}[Mir-Us]   Incorrect 'range' value; range cannot be less than zero.")
                 return None
             org = self._precursors_ID[prec_id].organism
+            if search_type == "up-downstream" or search_type == 0:
+                offsets = (-int_range, int_range)
+            elif search_type == "downstream" or search_type == 2:
+                offsets = (0, int_range)
+            elif search_type == "upstream" or search_type == 1:
+                offsets = (-int_range, 0)
+            else:
+                # unknown search type finds nothing
+                return None
             for coord in self._precursors_ID[prec_id].genome_coordinates:
                 start_position = int(coord[0])
-                search_prec2(self, start_position, org, int(range))
+                search_window(self, start_position + offsets[0], start_position + offsets[1], org)
         if not result:
             return None
 
         return result, len(result)
 
     @utils.time_this
+    @utils.memoize
     def get_tree(self, tax_path=None, verbose=False):
         """Returns taxonomy tree, where each taxonomy level is a dictionary (nested dictionaries as access to another
         taxonomy level and list of organisms at particular taxonomy level if has any)
@@ -1247,42 +1321,10 @@ class MiRBase:
             Returns `None` if wrong taxonomy path is given.
         """
 
-        tax_dct = self._make_tax_dict()
-
-        # structure def
-        def tree():
-            return dd(tree)
-
-        # function to create tree (nested default dicts)
-        def add_tree(t, keys):
-            for key in keys:
-                t = t[key]
-
-        # function to access keys
-        def access_tree(t, keys):
-            for key in keys:
-                t = t[key]
-            return t
-
-        # create tree with taxonomy
-        org_tree = tree()
-        for key in tax_dct:
-            add_tree(org_tree, tax_dct[key])
-
-        # add organisms
-        for key in tax_dct:
-            access_tree(org_tree, tax_dct[key])["!organism"] = [key]
-        for key in tax_dct:
-            if key not in access_tree(org_tree, tax_dct[key])["!organism"]:
-                access_tree(org_tree, tax_dct[key])["!organism"].append(key)
-
-        # sort in organism lists
-        for key in tax_dct:
-            access_tree(org_tree, tax_dct[key])["!organism"].sort()
-
+        # tree is made once, when organisms data is loaded
         if tax_path is not None:
             try:
-                tree_slice = dict(access_tree(org_tree, tax_path))
+                tree_slice = dict(self._tax_tree_paths[tuple(tax_path)])
                 if not tree_slice:
                     return None
                 #print(json.dumps(tree_slice, indent=4, sort_keys=True))
@@ -1291,7 +1333,7 @@ class MiRBase:
                 return None
         else:
             #print(json.dumps(dict(org_tree), indent=4, sort_keys=True))
-            return dict(org_tree), 1
+            return dict(self._tax_tree), 1
 
     @utils.time_this
     def high_conf(self, mirna_obj=None, prec_obj=None, verbose=False):
@@ -1328,6 +1370,12 @@ class MiRBase:
             return None
         return list(set(result)), len(result)
 
+    def clear_cache(self):
+        """Removes all cached search results, so following searches are conducted again.
+        """
+        with self._results_lock:
+            self._results_cache.clear()
+
     def dump_sequences(self, mirna_obj=None, prec_obj=None, filepath="", verbose=False):
         """Function writes sequences from given MiRNA or Precursor objects to a file in a FASTA format.
 
@@ -1389,15 +1437,20 @@ class MiRLoad(MiRBase):
         :return: Creates namedtuples of organisms
         """
 
+        # format of the file depends only on database version, so it is resolved once instead of for every line
+        old_format = self._miRBase_version != "CURRENT" and int(self._miRBase_version) < 19  # not gzipped, bytes
+        no_taxid = self._miRBase_version != "CURRENT" and int(self._miRBase_version) < 20  # taxid from Entrez
+
         def parse_organism_file(organisms_file):
             Entrez.email = "Your.Name.Here@example.org"
             for line in organisms_file:
-                if self._miRBase_version is not "CURRENT" and int(self._miRBase_version) < 19:
+                if old_format:
                     line = line.decode('utf-8')
                 if not line.startswith("#"):
-                    tmp = line.split('\t')
+                    # organism codes and names are interned - they are repeated in every record of the organism
+                    tmp = [sys.intern(field) for field in line.split('\t')]
                     self._org_sh[tmp[0]] = tmp[2]
-                    if self._miRBase_version is not "CURRENT" and int(self._miRBase_version) < 20:
+                    if no_taxid:
                         ent_handle = Entrez.esearch(db="taxonomy", retmax=10, term=tmp[2])
                         ent_record = Entrez.read(ent_handle)
                         try:
@@ -1411,7 +1464,7 @@ class MiRLoad(MiRBase):
                         self._organisms.append(org)
 
         with urllib.request.urlopen(file_path) as organisms_file_url:
-            if self._miRBase_version is not "CURRENT" and int(self._miRBase_version) < 19:
+            if old_format:
                 parse_organism_file(organisms_file_url)
             else:
                 with gzip.open(organisms_file_url, mode='rt') as organisms_file:
@@ -1429,10 +1482,10 @@ class MiRLoad(MiRBase):
             with gzip.open(miRNA_file_gz, mode='rt') as miRNA_file:
                 for line in miRNA_file:
                     if line.startswith("ID"):
-                        name_p = line.split()[1]
+                        name_p = sys.intern(line.split()[1])
                         while not line.startswith("AC"):
                             line = next(miRNA_file)
-                        id_p = line.split()[1][:-1]
+                        id_p = sys.intern(line.split()[1][:-1])
                         while not line.startswith("DE"):
                             line = next(miRNA_file)
                         org = name_p.split("-")[0]
@@ -1449,14 +1502,15 @@ class MiRLoad(MiRBase):
                             next_line = True
                             if line.startswith("FT") and "miRNA" in line and ".." in line:
                                 c += 1
-                                start = line.split()[2].split("..")[0]
-                                end = line.split()[2].split("..")[1].strip()
+                                # location field is split once for both ends
+                                start, end = line.split()[2].split("..")[:2]
+                                end = end.strip()
                                 products.append([start, end])
                             elif line.startswith("FT") and "/accession=" in line:
-                                ac = line.split("=")[1].replace('\"', '').strip()
+                                ac = sys.intern(line.split("=")[1].replace('\"', '').strip())
                                 products[c].append(ac)
                             elif line.startswith("FT") and "/product=" in line:
-                                name_mat = line.split("=")[1].replace('\"', '').strip()
+                                name_mat = sys.intern(line.split("=")[1].replace('\"', '').strip())
                                 products[c].append(name_mat)
                             elif line.startswith("FT") and "/evidence=" in line:
                                 ev = line.split("=")[1].replace('\"', '').strip()
@@ -1563,17 +1617,13 @@ class MiRLoad(MiRBase):
         :return: Complements Precursor objects with structures in dot-bracket format
         """
 
-        iupac = ['a', 'c', 'g', 't', 'u', 'r', 'y', 's', 'w', 'k', 'm', 'b', 'd', 'h', 'v', 'n']
-        start = 0
-        end = 7
-        x = 0
+        iupac = frozenset(['a', 'c', 'g', 't', 'u', 'r', 'y', 's', 'w', 'k', 'm', 'b', 'd', 'h', 'v', 'n'])
         with urllib.request.urlopen(file_path) as struct_file_gz:
             struct_file = gzip.open(struct_file_gz, mode='rt')
-            data = struct_file.readlines()
-            lines_num = len(data)
 
-            while x < lines_num:
-                data_list = data[start:end]
+            # file is streamed in records of 8 lines (7 lines of data and a blank line), instead of reading it whole
+            for record in iter(lambda: list(islice(struct_file, 8)), []):
+                data_list = record[:7]
                 jdl = "".join(data_list).splitlines()
                 new_list = [x for x in jdl if x]
                 name = new_list[0]
@@ -1587,40 +1637,25 @@ class MiRLoad(MiRBase):
                 all_dt_seq = ""
                 join_mrg_list = "".join(mrg_list).replace(" ", "")
 
-                dt_string1 = ""
-                for letter, leter2 in zip(join_mrg_list, new_list[3]):
-                    if (letter.lower() in iupac) and (leter2 == '|'):
-                        dt_string1 = dt_string1 + '('
-                    elif (letter.lower() in iupac) and not (leter2 == '|'):
-                        dt_string1 = dt_string1 + '.'
-                    else:
-                        continue
+                # nucleotides are classified with a lookup table (on ascii codes) instead of list membership
+                pairs = new_list[3].encode('ascii', 'replace')
+                pipe = ord('|')
+                dt_string1 = "".join('(' if leter2 == pipe else '.' for letter, leter2 in
+                                     zip(join_mrg_list.encode('ascii', 'replace'), pairs) if utils.iupac_lut[letter])
 
-                acgu_dt = [x.lower() for x in line_3 if x.lower() in iupac]
+                acgu_dt = [x for x in map(str.lower, line_3) if x in iupac]
                 if len(acgu_dt) == 1:
-                    acgu_dt = ''.join(acgu_dt).lower().replace("-", "")
-                    for nt in iupac:
-                        if nt in acgu_dt:
-                            acgu_dt = acgu_dt.replace(nt, '.')
+                    acgu_dt = ''.join(acgu_dt).lower().replace("-", "").translate(utils.iupac_to_dot)
                     dt_string1 = dt_string1 + acgu_dt
 
                 join_mrg_list2 = "".join(mrg_list2).replace(" ", "")
-                dt_string2 = ""
-
-                for letter, leter2 in zip(join_mrg_list2, new_list[3]):
-                    if (letter.lower() in iupac) and (leter2 == '|'):
-                        dt_string2 = dt_string2 + ')'
-                    elif (letter.lower() in iupac) and not (leter2 == '|'):
-                        dt_string2 = dt_string2 + '.'
+                dt_string2 = "".join(')' if leter2 == pipe else '.' for letter, leter2 in
+                                     zip(join_mrg_list2.encode('ascii', 'replace'), pairs) if utils.iupac_lut[letter])
 
                 revers_dt_string2 = dt_string2[::-1]
 
                 all_dt_seq = dt_string1 + revers_dt_string2
 
-                start = start + 8
-                end = end + 8
-                x = x + 8
-
                 id_prec = self._precursors_name[name2]
                 self._structures[id_prec] = all_dt_seq
 
@@ -1637,15 +1672,16 @@ class MiRLoad(MiRBase):
         tax_dct = dict(zip(organism_codes, tax_codes))
         # print(tax_dct)
 
-        for prec in self._precursors_ID:
-            p_id = self._precursors_ID[prec].ID
-            p_org = self._precursors_ID[prec].organism
+        for prec in self._precursors_ID.values():
+            p_id = prec.ID
+            p_org = prec.organism
             self._organisms_of_prec[p_org].append(p_id)
-            tax_name = tax_dct[p_org].split(';')[:-1]
-            self._precursors_ID[prec].taxonomy = tax_name
-            for tax_level in tax_name:
-                if not (p_id in self._taxonomy_of_prec[tax_level]):
-                    self._taxonomy_of_prec[tax_level].append(p_id)
+            tax_name = [sys.intern(tax_level) for tax_level in tax_dct[p_org].split(';')[:-1]]
+            prec.taxonomy = tax_name
+            # every precursor is visited once, so only its repeated tax levels have to be skipped (instead of
+            # searching whole lists of the level)
+            for tax_level in dict.fromkeys(tax_name):
+                self._taxonomy_of_prec[tax_level].append(p_id)
 
     def load_genome(self, file_path):
         """
@@ -1655,23 +1691,32 @@ class MiRLoad(MiRBase):
         :type file_path: str
         :return: Complements Precursor and miRNA objects with genomic information (chromosome, strand, coordinates)
         """
-        for org in self._org_sh:
+        def download(org):
             try:
                 with urllib.request.urlopen(file_path + org + '.gff3') as miRNA_file:
-                    file2 = miRNA_file.readlines()
+                    # whole file is decoded at once, instead of decoding every line separately
+                    return miRNA_file.read().decode('UTF-8').splitlines(keepends=True)
             except:
+                return None
+
+        # files are downloaded concurrently, but parsed one by one in order of organisms
+        with ThreadPoolExecutor(max_workers=utils.download_workers) as executor:
+            genome_files = list(executor.map(download, self._org_sh))
+        for file2 in genome_files:
+            if file2 is None:
                 continue
             for line in file2:
-                if not line.decode('UTF-8').startswith('#'):
-                    split_name = line.decode('UTF-8').split('\t')
-                    chr_miRNA = split_name[0]
+                if not line.startswith('#'):
+                    # attributes are the last (9th) column, so splitting stops there
+                    split_name = line.split('\t', 8)
+                    chr_miRNA = sys.intern(split_name[0])
                     miRNA_type = split_name[2]
                     start_seq = split_name[3].strip(' ')
                     end_seq = split_name[4].strip(' ')
-                    strand_seq = split_name[6]
+                    strand_seq = sys.intern(split_name[6])
                     info_miRNA = split_name[8]
                     split_info_miRNA = info_miRNA.split(';')
-                    sim_Alias = split_info_miRNA[1].split('=')[1]
+                    sim_Alias = sys.intern(split_info_miRNA[1].split('=')[1])
 
                     if miRNA_type == 'miRNA_primary_transcript':
                         try:
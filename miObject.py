@@ -40,6 +40,10 @@ class Precursor:
         references (list[str]): References from Pubmed (accession numbers)
     """
 
+    # fixed attributes are stored without per-object dictionaries, which saves memory of thousands of objects
+    __slots__ = ("ID", "name", "precursor_sequence", "structure", "chromosome", "genome_coordinates", "strand",
+                 "references", "organism", "taxonomy", "miRNAs", "high_confidence")
+
     def __init__(self, id, name, seq, org, ref, mirnas):
         # self.precursor_ID = id
         self.ID = id
@@ -56,9 +60,27 @@ class Precursor:
         self.miRNAs = mirnas  # objects of miRNA class
         self.high_confidence = False  # False by default
 
+    def __setstate__(self, state):
+        """Restores pickled object; objects pickled before `__slots__` were introduced have their attributes in a
+        dictionary.
+
+        Args:
+            state (Union[dict, tuple[Optional[dict], dict]]): Pickled attributes
+        """
+        _set_state(self, state)
+
     def __repr__(self):
         """Overridden print method to show Precursor object attributes in pretty and informative form.
 
+        Returns:
+            str: All attributes from an object in 'Attribute: values' form.
+        """
+        return self.pretty()
+
+    def pretty(self):
+        """Formats all Precursor object attributes in pretty and informative form. The text is made only when
+        requested (e.g. when the object is printed).
+
         Returns:
             str: All attributes from an object in 'Attribute: values' form.
         """
@@ -97,6 +119,9 @@ class MiRNA:
         references (list[str]): References from Pubmed (accession numbers)
     """
 
+    __slots__ = ("precursors", "name", "ID", "organism", "pair_ID", "mature_sequence", "mature_positions", "evidence",
+                 "experiment", "end", "chromosome", "genome_coordinates", "strand", "references")
+
     def __init__(self, prec, id, name, org, pos, evi, exp, end, ref):
         # self.precursor = prec
         self.precursors = prec
@@ -120,13 +145,31 @@ class MiRNA:
         self.strand = []
         self.references = ref
 
+    def __setstate__(self, state):
+        """Restores pickled object; objects pickled before `__slots__` were introduced have their attributes in a
+        dictionary.
+
+        Args:
+            state (Union[dict, tuple[Optional[dict], dict]]): Pickled attributes
+        """
+        _set_state(self, state)
+
     def __repr__(self):
         """Overridden print method to show miRNA object attributes in pretty and informative form.
 
         Returns:
             str: All attributes from an object in 'Attribute: values' form.
         """
-        gen_coords = pp.pformat(dict(self.genome_coordinates))
+        return self.pretty()
+
+    def pretty(self):
+        """Formats all miRNA object attributes in pretty and informative form. The text is made only when
+        requested (e.g. when the object is printed).
+
+        Returns:
+            str: All attributes from an object in 'Attribute: values' form.
+        """
+        gen_coords = _format_coordinates(self.genome_coordinates)
         info = f"""
         {Fore.YELLOW}Mature ID: {Fore.RESET}{', '.join(self.ID)} 
         {Fore.YELLOW}Mature name: {Fore.RESET}{', '.join(self.name)} 
@@ -155,3 +198,34 @@ class MiRNA:
         # return prec_seq[int(pos[0]) - 1:int(pos[1])]
         seq = prec_seq[int(pos[0]) - 1:int(pos[1])]
         self.mature_sequence.append(seq)
+
+
+def _set_state(obj, state):
+    """Sets pickled attributes of an object with `__slots__`
+
+    Args:
+        obj (Union[Precursor, MiRNA]): Unpickled object
+        state (Union[dict, tuple[Optional[dict], dict]]): Pickled attributes - a dictionary (objects pickled before
+        `__slots__` were introduced) or a pair of dictionaries (`__dict__` and slots)
+    """
+    if isinstance(state, tuple):
+        state = {**(state[0] or {}), **state[1]}
+    for key, value in state.items():
+        setattr(obj, key, value)
+
+
+def _format_coordinates(coordinates):
+    """Formats dictionary of genome coordinates the same way as `pprint.pformat()`, but without its overhead for
+    dictionaries which fit in a single line (nearly all of them)
+
+    Args:
+        coordinates (dict[str, list[tuple(str, str)]]): Genome coordinates of miRNA from affiliated precursors
+
+    Returns:
+        str: Formatted genome coordinates
+    """
+    text = "{" + ", ".join(f"{key!r}: {coordinates[key]!r}" for key in sorted(coordinates)) + "}"
+    if len(text) > 80:
+        # longer dictionaries are wrapped by pprint
+        return pp.pformat(dict(coordinates))
+    return text
@@ -3,10 +3,17 @@ Utility functions used in other modules.
 
 """
 
+import contextlib
 import functools
+import gc
+import inspect
 import os
+import pathlib
 import datetime
 import traceback
+import urllib.error
+import urllib.request
+from collections import defaultdict
 from timeit import default_timer as timer
 
 import dill
@@ -33,12 +40,29 @@ std_banner = f'''
         {Fore.MAGENTA}| o       0 | | o       0 | | o       0 | {Fore.MAGENTA} 8    Y     888   888   888              `88.    .8'  o.  )88b
         {Fore.CYAN}o           0 o           0 o           0 {Fore.CYAN}o8o        o888o o888o d888b               `YbodP'    8""888P'
         '''
+# maximal number of search results cached by a single MiRBase object
+results_cache_size = 1024
+
+# number of genome files downloaded at once during compilation of data files
+download_workers = 8
+
+# version of cache files format; cache files of other versions are made again
+cache_version = 7
+
+# lookup table of IUPAC nucleotide codes; indexed by character code, non-zero for nucleotides (in both cases)
+iupac_lut = bytearray(256)
+for _code in b"acgturyswkmbdhvnACGTURYSWKMBDHVN":
+    iupac_lut[_code] = 1
+
+# translation table replacing IUPAC nucleotide codes (lower case) with dots of dot-bracket notation
+iupac_to_dot = str.maketrans("acgturyswkmbdhvn", "." * 16)
 
 
 # UTILITY FUNCTIONS-----------------------------------------------------------
 def time_this(func):
     """
-    Decorator which returns information about execution of decorated function.
+    Decorator which returns information about execution of decorated function. Execution is timed only if
+    `verbose=True` is passed, so searches without shown details are not slowed down by timing.
 
     :param func: Any miBase function
     :return: Execution time and values returned by a function
@@ -46,26 +70,24 @@ def time_this(func):
 
     @functools.wraps(func)
     def wrapper_timer(*args, **kwargs):
-        passed_args = kwargs
+        # if not passed, by default verbose is False; then search is not timed at all
+        if kwargs.get("verbose") is not True:
+            values = func(*args, **kwargs)
+            try:
+                return None if values is None else values[0]
+            except IndexError:
+                print(f"{Fore.RED}[Mir-Us]  {func.__name__!r} No records matching given criteria.")
+                return None
         start = timer()
         values = func(*args, **kwargs)
         # print(values)
         end = timer()
         runtime = end - start
         try:
-            if passed_args["verbose"] is True:
-                if values is None:
-                    print(f"{Fore.RED}[Mir-Us]  {func.__name__!r} No records matching given criteria.")
-                else:
-                    print(f"{Fore.GREEN}[Mir-Us]  {func.__name__!r} found {values[1]} results in {runtime:.6f} seconds")
-                    return values[0]
-            else:
-                return values[0]
-        # if not passed, by default verbose is False
-        except KeyError:
             if values is None:
-                pass
+                print(f"{Fore.RED}[Mir-Us]  {func.__name__!r} No records matching given criteria.")
             else:
+                print(f"{Fore.GREEN}[Mir-Us]  {func.__name__!r} found {values[1]} results in {runtime:.6f} seconds")
                 return values[0]
         except IndexError:
             print(f"{Fore.RED}[Mir-Us]  {func.__name__!r} No records matching given criteria.")
@@ -73,6 +95,116 @@ def time_this(func):
     return wrapper_timer
 
 
+def accept_scalar_or_list(*arg_names):
+    """
+    Decorator which wraps single string arguments into lists, so decorated function always receives lists of values.
+    Empty strings and other values are passed unchanged.
+
+    :param arg_names: Names of arguments which accept a single value or a list of values
+    :return: Decorated function
+    """
+
+    def decorator(func):
+        params = list(inspect.signature(func).parameters)
+        positions = tuple((name, params.index(name)) for name in arg_names)
+
+        @functools.wraps(func)
+        def wrapper_normalize(*args, **kwargs):
+            # arguments are copied only if one of them has to be wrapped
+            for name, pos in positions:
+                if pos < len(args):
+                    value = args[pos]
+                    if isinstance(value, str) and value:
+                        args = args[:pos] + ([value],) + args[pos + 1:]
+                else:
+                    value = kwargs.get(name)
+                    if isinstance(value, str) and value:
+                        kwargs[name] = [value]
+            return func(*args, **kwargs)
+
+        return wrapper_normalize
+
+    return decorator
+
+
+def memoize(func):
+    """
+    Decorator which caches results of decorated MiRBase search function. Loaded data is never modified, so cached
+    results stay valid; only the least recently used results are dropped when the cache is full. Searches without
+    results are not cached, so their messages are shown every time. Returned lists and dictionaries are copies, so
+    modifying them does not affect the cache. Access to the cache is guarded by `_results_lock`, so decorated functions
+    can be called from multiple threads.
+
+    :param func: MiRBase search function
+    :return: Decorated function
+    """
+
+    @functools.wraps(func)
+    def wrapper_memoize(self, *args, **kwargs):
+        # key is made directly from passed arguments (without binding them to the signature), so the same search
+        # passed in a different way (e.g. positional instead of keyword argument) is cached separately
+        key = (func.__name__, _hashable(args),
+               _hashable(sorted((name, value) for name, value in kwargs.items() if name != "verbose")))
+        try:
+            with self._results_lock:
+                values = self._results_cache.get(key)
+                if values is not None:
+                    self._results_cache.move_to_end(key)
+        except TypeError:
+            # arguments which cannot be hashed are not cached
+            return func(self, *args, **kwargs)
+        if values is None:
+            # search itself runs outside of the lock, so concurrent searches are not serialized
+            values = func(self, *args, **kwargs)
+            if values is None:
+                return None
+            with self._results_lock:
+                self._results_cache[key] = values
+                if len(self._results_cache) > results_cache_size:
+                    self._results_cache.popitem(last=False)
+        return _copy_containers(values[0]), values[1]
+
+    return wrapper_memoize
+
+
+def _hashable(value):
+    """Utility function, which converts lists, sets and dictionaries (also nested) to their hashable equivalents.
+    Every value is paired with its type, so equal values of different types (e.g. `True` and `1`, or a dictionary and
+    a list of its items) are not converted to the same key.
+
+    Args:
+        value (Any): Value to convert
+
+    Returns:
+        Any: Hashable value (if all nested values can be hashed)
+    """
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_hashable(elem) for elem in value)
+    if isinstance(value, (set, frozenset)):
+        return type(value), frozenset(_hashable(elem) for elem in value)
+    if isinstance(value, dict):
+        return type(value), tuple((_hashable(key), _hashable(elem)) for key, elem in value.items())
+    return type(value), value
+
+
+def _copy_containers(value):
+    """Utility function, which copies lists and dictionaries (also nested), leaving other objects shared
+
+    Args:
+        value (Any): Value to copy
+
+    Returns:
+        Any: Copied value
+    """
+    if isinstance(value, list):
+        return [_copy_containers(elem) for elem in value]
+    if isinstance(value, defaultdict):
+        return defaultdict(value.default_factory, {key: _copy_containers(elem) for key, elem in value.items()})
+    if isinstance(value, dict):
+        return {key: _copy_containers(elem) for key, elem in value.items()}
+    return value
+
+
 def _fatal_error_handle(e):
     msg = f"\n{Fore.RED}[Mir-Us]   Error! Cannot compile data files:"
     if isinstance(e, KeyError):
@@ -95,20 +227,67 @@ def _cache_versions():
         return dill.loads(ver.read())
 
 
-def _exists(to_compare, obj):
-    """Utility function, which compares list of objects to particular object, to check if compared object is present
-     in the list
+def _is_up_to_date(cache_files, data_files):
+    """Utility function, which checks if cache files exist and are not older than data files they were made from
+
+    Args:
+        cache_files (tuple[str]): Paths to cache files
+        data_files (tuple[str]): Paths to data files
+
+    Returns:
+        bool: True if all cache files can be used
+    """
+    if not all(os.path.isfile(path) for path in cache_files):
+        return False
+    return min(map(os.path.getmtime, cache_files)) >= max(map(os.path.getmtime, data_files))
+
+
+def _download(url, directory):
+    """Utility function, which downloads a file to a given directory
 
     Args:
-        to_compare (list[Any]): List of objects to compare
-        obj (Any): Object to be compared with list of objects
+        url (str): URL of the file
+        directory (str): Path to the target directory
 
     Returns:
-        bool: True if compared object is present in the list of objects
+        str: URL of the downloaded file (file://) or the given URL, if the file cannot be downloaded (network or disk
+        error) - then it is downloaded again by a loader, which raises the error if it persists
+    """
+    try:
+        path = os.path.join(directory, os.path.basename(url))
+        urllib.request.urlretrieve(url, path)
+        return pathlib.Path(path).as_uri()
+    except (urllib.error.URLError, OSError) as e:
+        print(f"{Fore.YELLOW}[Mir-Us]   Cannot download {url} in advance ({e}); it will be downloaded by the loader.")
+        return url
+
+
+def _atomic_dump(path, dump):
+    """Utility function, which writes a file at once - data is written to a temporary file, which then replaces
+    the target file, so unfinished files are never left at the target path
+
+    Args:
+        path (str): Path to the target file
+        dump (Callable): Function writing data to a given file handle
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as fh_dump:
+        dump(fh_dump)
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Utility context manager, which pauses garbage collection. Loading data files creates hundreds of thousands
+    of objects at once, which would trigger many useless collections.
     """
-    for elem in to_compare:
-        if elem is obj:
-            return True
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 def _show_banner():